@@ -3,6 +3,7 @@ API endpoints for NDVI and NDWI indices operations
 """
 from fastapi import APIRouter, HTTPException, status
 from uuid import UUID
+import asyncio
 import logging
 
 from utils.response_formatter import success_response, created_response
@@ -23,7 +24,7 @@ async def get_ndvi_data(image_id: UUID):
     try:
         logger.info(f"Fetching NDVI data for image: {image_id}")
         
-        data = supabase_service.get_ndvi_data(str(image_id))
+        data = await supabase_service.get_ndvi_data(str(image_id))
         
         if not data:
             raise NotFoundError(f"NDVI data not found for image {image_id}")
@@ -50,7 +51,7 @@ async def get_ndwi_data(image_id: UUID):
     try:
         logger.info(f"Fetching NDWI data for image: {image_id}")
         
-        data = supabase_service.get_ndwi_data(str(image_id))
+        data = await supabase_service.get_ndwi_data(str(image_id))
         
         if not data:
             raise NotFoundError(f"NDWI data not found for image {image_id}")
@@ -77,15 +78,15 @@ async def get_all_indices(image_id: UUID):
     try:
         logger.info(f"Fetching all indices for image: {image_id}")
         
-        # Get image info
-        image = supabase_service.get_satellite_image_by_id(str(image_id))
+        # Image info and both indices are independent lookups
+        image, ndvi_data, ndwi_data = await asyncio.gather(
+            supabase_service.get_satellite_image_by_id(str(image_id)),
+            supabase_service.get_ndvi_data(str(image_id)),
+            supabase_service.get_ndwi_data(str(image_id))
+        )
         if not image:
             raise NotFoundError(f"Satellite image {image_id} not found")
         
-        # Get indices
-        ndvi_data = supabase_service.get_ndvi_data(str(image_id))
-        ndwi_data = supabase_service.get_ndwi_data(str(image_id))
-        
         return success_response(
             data={
                 "image": image,
@@ -132,13 +133,14 @@ async def get_indices_status(image_id: UUID):
     try:
         logger.info(f"Checking indices status for image: {image_id}")
         
-        # Check if image exists
-        image = supabase_service.get_satellite_image_by_id(str(image_id))
+        # Check if image exists and look up indices in parallel
+        image, status = await asyncio.gather(
+            supabase_service.get_satellite_image_by_id(str(image_id), columns='id, product_id'),
+            supabase_service.check_image_has_indices(str(image_id))
+        )
         if not image:
             raise NotFoundError(f"Satellite image {image_id} not found")
         
-        status = supabase_service.check_image_has_indices(str(image_id))
-        
         return success_response(
             data={
                 "image_id": str(image_id),
@@ -42,7 +42,7 @@ async def get_region_statistics(
         logger.info(f"Fetching region statistics: date={date}, index={index_type_upper}, region={region_name}")
         
         # Get data from Supabase
-        geojson_data = supabase_service.get_region_statistics_geojson(
+        geojson_data = await supabase_service.get_region_statistics_geojson(
             date=date,
             index_type=index_type_upper,
             region_name=region_name
@@ -86,7 +86,7 @@ async def get_available_dates(
     try:
         logger.info(f"Fetching available dates: index={index_type}, region={region_name}")
         
-        dates = supabase_service.get_available_dates(
+        dates = await supabase_service.get_available_dates(
             index_type=index_type.upper() if index_type else None,
             region_name=region_name
         )
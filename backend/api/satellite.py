@@ -2,7 +2,7 @@
 API endpoints for satellite data operations
 """
 from fastapi import APIRouter, Query, Depends, HTTPException, status
-from typing import List, Optional
+from typing import List, Optional, Literal
 from uuid import UUID
 from datetime import date
 import logging
@@ -14,9 +14,15 @@ from models.satellite_image import (
     CopernicusProduct
 )
 from utils.validators import SatelliteSearchRequest, SatelliteFilterParams
-from utils.response_formatter import success_response, paginated_response, created_response
+from utils.response_formatter import (
+    success_response,
+    paginated_response,
+    cursor_paginated_response,
+    created_response,
+    to_soa
+)
 from utils.error_handlers import NotFoundError, SupabaseError, CopernicusAPIError
-from services.supabase_service import supabase_service
+from services.supabase_service import supabase_service, encode_cursor
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -29,26 +35,45 @@ async def list_satellite_images(
     cloud_max: Optional[float] = Query(30, ge=0, le=100, description="Maximum cloud coverage %"),
     platform: Optional[str] = Query(None, description="Satellite platform"),
     page: int = Query(1, ge=1, description="Page number"),
-    limit: int = Query(10, ge=1, le=100, description="Items per page")
+    limit: int = Query(10, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Keyset cursor from meta.pagination.next_cursor; overrides page"),
+    response_format: Literal["rows", "soa"] = Query("rows", alias="format", description="'soa' returns {columns, rows} instead of a list of objects")
 ):
     try:
-        data, total = supabase_service.get_satellite_images(
+        data, total = await supabase_service.get_satellite_images(
             date_from=date_from,
             date_to=date_to,
             cloud_max=cloud_max,
             platform=platform,
             page=page,
-            limit=limit
+            limit=limit,
+            cursor=cursor
         )
         
+        next_cursor = encode_cursor(data[-1]) if len(data) == limit else None
+        items = to_soa(data) if response_format == "soa" else data
+        message = "Satellite images retrieved successfully"
+        
+        if cursor:
+            return cursor_paginated_response(
+                data=items,
+                limit=limit,
+                next_cursor=next_cursor,
+                message=message
+            )
+        
         return paginated_response(
-            data=data,
+            data=items,
             page=page,
             limit=limit,
             total=total,
-            message="Satellite images retrieved successfully"
+            message=message,
+            next_cursor=next_cursor
         )
         
+    except ValueError as e:
+        # Malformed cursor
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error fetching satellite images: {str(e)}")
         raise SupabaseError(f"Failed to fetch satellite images: {str(e)}")
@@ -57,7 +82,7 @@ async def list_satellite_images(
 @router.get("/satellite-data/{image_id}", response_model=dict)
 async def get_satellite_image(image_id: UUID):
     try:
-        data = supabase_service.get_satellite_image_by_id(str(image_id))
+        data = await supabase_service.get_satellite_image_by_id(str(image_id))
         
         if not data:
             raise NotFoundError(f"Satellite image with ID {image_id} not found")
@@ -94,7 +119,7 @@ async def get_satellite_image(image_id: UUID):
 @router.post("/satellite-data", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_satellite_image(image: SatelliteImageCreate):
     try:
-        data = supabase_service.insert_satellite_image(image.model_dump())
+        data = await supabase_service.insert_satellite_image(image.model_dump())
         
         return created_response(
             data=data,
@@ -109,7 +134,7 @@ async def create_satellite_image(image: SatelliteImageCreate):
 @router.delete("/satellite-data/{image_id}", response_model=dict)
 async def delete_satellite_image(image_id: UUID):
     try:
-        success = supabase_service.delete_satellite_image(str(image_id))
+        success = await supabase_service.delete_satellite_image(str(image_id))
         
         if not success:
             raise NotFoundError(f"Satellite image with ID {image_id} not found")
@@ -138,7 +163,7 @@ async def get_images_in_bounds(
     limit: int = Query(100, ge=1, le=100)
 ):
     try:
-        data = supabase_service.get_images_in_bounds(
+        data = await supabase_service.get_images_in_bounds(
             min_lat=min_lat,
             max_lat=max_lat,
             min_lon=min_lon,
@@ -1,10 +1,13 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from services.sentinelhub_service import sentinelhub_service
+from itertools import chain
 from typing import Optional
+import orjson
 
 router = APIRouter()
 
-@router.get("/bounds/search", response_model=dict)
+@router.get("/bounds/search")
 def search_sentinelhub_bounds(
     min_lat: float,
     max_lat: float,
@@ -19,13 +22,15 @@ def search_sentinelhub_bounds(
     Proxy endpoint to search SentinelHub Catalog
     Matches the frontend expectation: /api/satellite-data/bounds/search
     (This will be mounted under /api/satellite-data)
+    
+    Scenes are streamed as NDJSON, one JSON object per line.
     """
     try:
         # Defaults if not provided
         d_from = date_from or "2024-01-01"
         d_to = date_to or "2024-12-05"
         
-        results = sentinelhub_service.search_catalog(
+        scenes = sentinelhub_service.search_catalog(
             bbox=[min_lon, min_lat, max_lon, max_lat],
             date_from=d_from,
             date_to=d_to,
@@ -33,7 +38,16 @@ def search_sentinelhub_bounds(
             limit=limit
         )
         
-        return {"status": "success", "data": results}
+        # Pull the first scene here so auth/config errors still surface as a 500
+        # instead of a truncated stream
+        first = next(scenes, None)
+        if first is not None:
+            scenes = chain([first], scenes)
+        
+        return StreamingResponse(
+            (orjson.dumps(scene) + b"\n" for scene in scenes),
+            media_type="application/x-ndjson"
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
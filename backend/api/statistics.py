@@ -30,7 +30,7 @@ async def get_image_statistics(
     try:
         logger.info(f"Fetching statistics for image: {image_id}")
         
-        stats = supabase_service.get_statistics(str(image_id))
+        stats = await supabase_service.get_statistics(str(image_id))
         
         if not stats:
             raise NotFoundError(f"Statistics for image {image_id} not found")
@@ -73,7 +73,7 @@ async def get_timeseries_data(
         d_from = str(date_from) if date_from else None
         d_to = str(date_to) if date_to else None
         
-        data = supabase_service.get_region_statistics_timeseries(
+        data = await supabase_service.get_region_statistics_timeseries(
             region_name=area_name,
             index_type=index_type.upper(),
             date_from=d_from,
@@ -112,7 +112,7 @@ async def get_area_summary(
     try:
         logger.info(f"Fetching area summary for bounds: ({min_lat},{min_lon}) to ({max_lat},{max_lon})")
         
-        summary = supabase_service.get_area_summary(
+        summary = await supabase_service.get_area_summary(
             min_lat=min_lat,
             max_lat=max_lat,
             min_lon=min_lon,
@@ -13,7 +13,7 @@ router = APIRouter()
 
 
 @router.get("/wms/image")
-async def get_wms_image(
+def get_wms_image(
     bbox: str = Query(..., description="Bounding box: min_lon,min_lat,max_lon,max_lat"),
     date: str = Query(..., description="Date in YYYY-MM-DD format"),
     index_type: str = Query(..., description="Index type: NDVI, NDWI, NDBI, MOISTURE"),
@@ -50,6 +50,7 @@ async def get_wms_image(
         logger.info(f"Fetching WMS image: bbox={bbox}, date={date}, index={index_type_upper}")
         
         # Get image from Sentinel Hub
+        # Blocking HTTP call; the handler is a plain def so FastAPI runs it in a worker thread
         image_data = sentinel_hub_wms_service.get_image(
             bbox=bbox_coords,
             date=date,
@@ -79,7 +80,7 @@ async def get_wms_image(
 
 
 @router.get("/wms/tile/{z}/{x}/{y}.png")
-async def get_wms_tile(
+def get_wms_tile(
     z: int,
     x: int,
     y: int,
@@ -123,6 +124,7 @@ async def get_wms_tile(
         logger.info(f"Fetching tile: z={z}, x={x}, y={y}, date={date}, index={index_type_upper}")
         
         # Get image from Sentinel Hub
+        # Blocking HTTP call; the handler is a plain def so FastAPI runs it in a worker thread
         image_data = sentinel_hub_wms_service.get_image(
             bbox=bbox_coords,
             date=date,
@@ -39,6 +39,8 @@ class Settings(BaseSettings):
     # Sentinel Hub
     SH_CLIENT_ID: str = ""
     SH_CLIENT_SECRET: str = ""
+    SH_CACHE_DIR: str = "/tmp/sh_cache"
+    SH_CACHE_TTL: int = 24 * 3600  # Sentinel-2 revisit is ~5 days
 
     # MapTiler
     MAPTILER_API_KEY: str = ""
@@ -46,6 +48,11 @@ class Settings(BaseSettings):
     # Cache
     CACHE_TTL: int = 3600  # 1 hour
     CACHE_MAX_SIZE: int = 1000
+    REDIS_URL: str = ""  # empty disables the Redis cache
+    SATELLITE_LIST_CACHE_TTL: int = 60
+    READ_CACHE_L1_TTL: int = 60
+    READ_CACHE_L2_TTL: int = 3600
+    READ_CACHE_MAX_SIZE: int = 10_000
     
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = False
@@ -92,7 +92,7 @@ class SatelliteDataScheduler:
             # Sentinel Hub Statistical API returns aggregated stats, not single 'products'.
             # We might need to synthesize a 'product' or image entry for the day/interval.
             
-            self._save_statistics_to_db(stats, bbox)
+            await self._save_statistics_to_db(stats, bbox)
             
             self.successful_runs += 1
             logger.info("✅ Scheduler job completed successfully")
@@ -102,7 +102,7 @@ class SatelliteDataScheduler:
             self.failed_runs += 1
             
     @staticmethod
-    def _save_statistics_to_db(stats: dict, bbox: List[float]):
+    async def _save_statistics_to_db(stats: dict, bbox: List[float]):
         """
         Save statistical data to Supabase 'region_statistics' table.
         """
@@ -111,7 +111,7 @@ class SatelliteDataScheduler:
         for item in stats.get('ndvi', []):
             dates.add(item['date'].split('T')[0])
             
-        count = 0
+        entries = []
         for date_str in dates:
             # Find stats for this date
             ndvi_stat = next((s for s in stats['ndvi'] if s['date'].startswith(date_str)), {})
@@ -147,19 +147,19 @@ class SatelliteDataScheduler:
                 "provider": "Sentinel Hub Statistical API"
             }
             
-            # Insert
-            # We use upsert if possible, or just insert. 
-            # Sentinel Hub might return multiple entries for same day if orbits overlap? 
-            # Usually one per day for aggregated.
-            try:
-                # Upsert based on region_name + date to avoid duplicates
-                supabase_service.client.table('region_statistics').upsert(entry, on_conflict='region_name, date').execute()
-                count += 1
-                logger.info(f"Saved stats for {date_str}")
-            except Exception as e:
-                logger.error(f"Failed to save stats for {date_str}: {e}")
-                
-        logger.info(f"Total days saved: {count}")
+            entries.append(entry)
+            
+        # Insert
+        # Sentinel Hub might return multiple entries for same day if orbits overlap? 
+        # Usually one per day for aggregated.
+        try:
+            # Upsert based on region_name + date to avoid duplicates, all days in bulk requests
+            saved = await supabase_service.upsert_region_statistics_bulk(entries, on_conflict='region_name, date')
+            logger.info(f"Total days saved: {len(saved)}")
+            # One view refresh for the whole batch of upserts
+            await supabase_service.refresh_region_stats_dates()
+        except Exception as e:
+            logger.error(f"Failed to save stats for {len(entries)} days: {e}")
 
     def start(self):
         """Start the scheduler"""
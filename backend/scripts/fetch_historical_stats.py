@@ -36,7 +36,7 @@ async def fetch_and_save_stats(region_name: str, bbox: List[float]):
     try:
         # Clear existing stats for this region to avoid duplicates
         logger.info(f"Cleaning up old stats for {region_name}...")
-        supabase_service.client.table('region_statistics').delete().eq('region_name', region_name).execute()
+        await supabase_service.delete_region_statistics(region_name)
 
         # Fetch stats from Sentinel Hub
         logger.info(f"Fetching stats for {region_name} from {time_interval[0]} to {time_interval[1]}")
@@ -46,42 +46,25 @@ async def fetch_and_save_stats(region_name: str, bbox: List[float]):
             resolution=100  # 100m resolution is enough for regional stats
         )
         
-        # Save NDVI
-        ndvi_data = stats.get("ndvi", [])
-        logger.info(f"Found {len(ndvi_data)} NDVI records for {region_name}")
-        
-        for record in ndvi_data:
-            supabase_service.insert_region_statistics({
-                "region_name": region_name,
-                "date": record["date"],
-                "index_type": "NDVI",
-                "mean": record["mean"],
-                "min": record["min"],
-                "max": record["max"],
-                "std": record["stDev"],
-                "sample_count": record["sample_count"],
-                # "bbox": f"POLYGON(({bbox[0]} {bbox[1]}, {bbox[2]} {bbox[1]}, {bbox[2]} {bbox[3]}, {bbox[0]} {bbox[3]}, {bbox[0]} {bbox[1]}))"
-            })
+        rows = []
+        for index_type in ("ndvi", "ndwi"):
+            records = stats.get(index_type, [])
+            logger.info(f"Found {len(records)} {index_type.upper()} records for {region_name}")
             
-        # Save NDWI
-        ndwi_data = stats.get("ndwi", [])
-        logger.info(f"Found {len(ndwi_data)} NDWI records for {region_name}")
+            for record in records:
+                rows.append({
+                    "region_name": region_name,
+                    "date": record["date"],
+                    "index_type": index_type.upper(),
+                    "mean": record["mean"],
+                    "min": record["min"],
+                    "max": record["max"],
+                    "std": record["stDev"],
+                    "sample_count": record["sample_count"]
+                })
         
-        for record in ndvi_data: # TYPO DETECTED in previous thought process? No, using ndvi_data variable name by mistake? 
-            # Using correct variable here:
-            pass 
-
-        for record in ndwi_data:
-            supabase_service.insert_region_statistics({
-                "region_name": region_name,
-                "date": record["date"],
-                "index_type": "NDWI",
-                "mean": record["mean"],
-                "min": record["min"],
-                "max": record["max"],
-                "std": record["stDev"],
-                "sample_count": record["sample_count"]
-            })
+        # Save NDVI and NDWI in bulk requests
+        await supabase_service.insert_region_statistics_bulk(rows)
             
         logger.info(f"✅ Completed {region_name}")
         
@@ -104,6 +87,9 @@ def main():
     
     for region, bbox in REGIONS.items():
         loop.run_until_complete(fetch_and_save_stats(region, bbox))
+    
+    # Rebuild available dates once, after every region is written
+    loop.run_until_complete(supabase_service.refresh_region_stats_dates())
         
     logger.info("All regions processed.")
 
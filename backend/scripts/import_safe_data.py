@@ -156,7 +156,7 @@ class SafeProductImporter:
                 return matches[0]
         return None
 
-    def import_product(self, safe_path: str):
+    async def import_product(self, safe_path: str):
         try:
             logger.info(f"Importing {safe_path}...")
             product_data = self.parse_metadata(safe_path)
@@ -177,7 +177,7 @@ class SafeProductImporter:
             
             # Insert satellite image
             logger.info(f"Saving metadata for {product_data['product_id']}")
-            result = supabase_service.insert_satellite_image(db_data)
+            result = await supabase_service.insert_satellite_image(db_data)
             image_id = result['id']
             
             # Find Bands
@@ -195,7 +195,7 @@ class SafeProductImporter:
                         red_band_path=b04_path,
                         image_id=image_id
                     )
-                    supabase_service.insert_ndvi_data(ndvi_data)
+                    await supabase_service.insert_ndvi_data(ndvi_data)
                     logger.info("NDVI calculation complete")
                 except Exception as e:
                     logger.error(f"Failed to calculate NDVI from bands: {e}")
@@ -207,7 +207,7 @@ class SafeProductImporter:
                     cloud_coverage=product_data['cloud_coverage'],
                     center_point=product_data['center_point']
                 )
-                supabase_service.insert_ndvi_data(ndvi_data)
+                await supabase_service.insert_ndvi_data(ndvi_data)
             
             # Calculate NDWI
             if b03_path and b08_path:
@@ -219,7 +219,7 @@ class SafeProductImporter:
                         nir_band_path=b08_path,
                         image_id=image_id
                     )
-                    supabase_service.insert_ndwi_data(ndwi_data)
+                    await supabase_service.insert_ndwi_data(ndwi_data)
                     logger.info("NDWI calculation complete")
                 except Exception as e:
                     logger.error(f"Failed to calculate NDWI from bands: {e}")
@@ -231,7 +231,7 @@ class SafeProductImporter:
                     cloud_coverage=product_data['cloud_coverage'],
                     center_point=product_data['center_point']
                 )
-                supabase_service.insert_ndwi_data(ndwi_data)
+                await supabase_service.insert_ndwi_data(ndwi_data)
             
             logger.info(f"Successfully imported {product_data['product_id']}")
             return True
@@ -240,6 +240,14 @@ class SafeProductImporter:
             logger.error(f"Failed to import {safe_path}: {e}")
             return False
 
+    async def import_all(self, products) -> int:
+        """Import products one by one, returning the number of successes"""
+        success_count = 0
+        for product_path in products:
+            if await self.import_product(product_path):
+                success_count += 1
+        return success_count
+
 def main():
     setup_logging()
     
@@ -257,10 +265,7 @@ def main():
         
     print(f"Found {len(products)} products. Starting import...")
     
-    success_count = 0
-    for product_path in products:
-        if importer.import_product(product_path):
-            success_count += 1
+    success_count = asyncio.run(importer.import_all(products))
             
     print(f"\nImport complted: {success_count}/{len(products)} successful.")
 
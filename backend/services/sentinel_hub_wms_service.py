@@ -4,7 +4,9 @@ Sentinel Hub WMS/Process API Service.
 import os
 import logging
 from typing import Dict, List, Optional
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -17,11 +19,22 @@ class SentinelHubWMSService:
         self.base_url = "https://services.sentinel-hub.com"
         self.token = None
         self.token_expires = None
+        self._session = requests.Session()
+        # Keep concurrent tile fetches on warm connections (requests pools 10 by default)
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32
+        ))
+        self._creds_ok = bool(self.client_id and self.client_secret)
         
-        if not self.client_id or not self.client_secret:
+        if not self._creds_ok:
             logger.warning("Sentinel Hub credentials not found")
     
     def get_access_token(self) -> str:
+        # Fail before opening a connection that can only be rejected
+        if not self._creds_ok:
+            raise RuntimeError("SH_CLIENT_ID/SH_CLIENT_SECRET not set")
+        
         if self.token and self.token_expires and datetime.now() < self.token_expires:
             return self.token
         
@@ -33,7 +46,7 @@ class SentinelHubWMSService:
         }
         
         try:
-            response = requests.post(token_url, data=data)
+            response = self._session.post(token_url, data=data)
             response.raise_for_status()
             
             token_data = response.json()
@@ -213,7 +226,8 @@ class SentinelHubWMSService:
                 'Accept': 'image/png'
             }
             
-            response = requests.post(url, json=request_payload, headers=headers)
+            body = orjson.dumps(request_payload)
+            response = self._session.post(url, data=body, headers=headers)
             response.raise_for_status()
             
             return response.content
@@ -1,56 +1,76 @@
 import os
+import copy
 import logging
+from itertools import islice
 from datetime import datetime, date
-from typing import List, Dict, Any, Tuple, Optional
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple, Optional, Iterator
 import statistics
 
 from sentinelhub import (
     SHConfig,
+    SentinelHubSession,
+    SentinelHubStatisticalDownloadClient,
     SentinelHubStatistical,
+    SentinelHubCatalog,
     DataCollection,
-    Geometry,
     CRS,
-    BBox
+    BBox,
+    parse_time_interval,
+    serialize_time
 )
 from shapely.geometry import Polygon
 
+from config.settings import settings
+from utils.cache import TwoTierCache, cached, make_cache_key
+
 logger = logging.getLogger(__name__)
 
+# Placeholder interval for cached request skeletons; replaced on every call
+_TEMPLATE_TIME_INTERVAL = ("2000-01-01", "2000-01-02")
+
+_stats_cache = TwoTierCache(
+    directory=settings.SH_CACHE_DIR,
+    ttl=settings.SH_CACHE_TTL,
+    max_size=settings.CACHE_MAX_SIZE
+)
+
+
+def _statistics_cache_key(
+    service: "SentinelHubService",
+    bbox_coords: List[float],
+    time_interval: Tuple[str, str],
+    aggregation_period: str = "P1D",
+    resolution: int = 100
+) -> Optional[str]:
+    # Intervals reaching today may still gain scenes, and the scheduler's
+    # rolling windows never repeat, so only closed past intervals are cached
+    if time_interval[1][:10] >= date.today().isoformat():
+        return None
+    # Round bbox to ~1 m so small pan jitter still hits the cache
+    return make_cache_key(
+        "statistics",
+        [round(c, 5) for c in bbox_coords],
+        list(time_interval),
+        aggregation_period,
+        resolution,
+        service.INDICES_EVALSCRIPT
+    )
+
 class SentinelHubService:
     """
     Service for interacting with Sentinel Hub API using Evalscript V3 
     and Statistical API.
     """
     
-    # Evalscript for NDVI
-    NDVI_EVALSCRIPT = """
+    # Evalscript computing NDVI and NDWI in one pass (one Statistical API request)
+    INDICES_EVALSCRIPT = """
     //VERSION=3
     function setup() {
         return {
-            input: ["B04", "B08", "dataMask"],
+            input: ["B03", "B04", "B08", "dataMask"],
             output: [
                 { id: "ndvi", bands: 1 },
-                { id: "dataMask", bands: 1 }
-            ]
-        };
-    }
-
-    function evaluatePixel(sample) {
-        let ndvi = (sample.B08 - sample.B04) / (sample.B08 + sample.B04);
-        return {
-            ndvi: [ndvi],
-            dataMask: [sample.dataMask]
-        };
-    }
-    """
-
-    # Evalscript for NDWI
-    NDWI_EVALSCRIPT = """
-    //VERSION=3
-    function setup() {
-        return {
-            input: ["B03", "B08", "dataMask"],
-            output: [
                 { id: "ndwi", bands: 1 },
                 { id: "dataMask", bands: 1 }
             ]
@@ -58,8 +78,10 @@ class SentinelHubService:
     }
 
     function evaluatePixel(sample) {
+        let ndvi = (sample.B08 - sample.B04) / (sample.B08 + sample.B04);
         let ndwi = (sample.B03 - sample.B08) / (sample.B03 + sample.B08);
         return {
+            ndvi: [ndvi],
             ndwi: [ndwi],
             dataMask: [sample.dataMask]
         };
@@ -68,11 +90,14 @@ class SentinelHubService:
 
     def __init__(self):
         self._config = None
+        self._catalog = None
+        self._download_client = None
+        # Per-instance cache of request skeletons; an lru_cache on the method
+        # itself would live on the class and keep every instance alive
+        self._build_request = lru_cache(maxsize=256)(self._build_request)
         self._init_config()
 
     def _init_config(self):
-        from config.settings import settings
-        
         client_id = settings.SH_CLIENT_ID
         client_secret = settings.SH_CLIENT_SECRET
         
@@ -80,10 +105,27 @@ class SentinelHubService:
             self._config = SHConfig()
             self._config.sh_client_id = client_id
             self._config.sh_client_secret = client_secret
+            self._catalog = SentinelHubCatalog(config=self._config)
             logger.info("SentinelHub config initialized")
         else:
             logger.error("SentinelHub credentials missing (SH_CLIENT_ID, SH_CLIENT_SECRET). Service will fail.")
 
+    def _get_download_client(self) -> SentinelHubStatisticalDownloadClient:
+        """
+        Shared Statistical API download client bound to one OAuth session.
+        
+        The session keeps the bearer token in memory and only fetches a new
+        one when it is within 60 s of expiry. Created lazily so importing the
+        module never hits the auth endpoint. The Statistical client (the one
+        request.get_data() would use) re-requests intervals that failed with
+        EXECUTION_ERROR or TIMEOUT.
+        """
+        if self._download_client is None:
+            session = SentinelHubSession(config=self._config, refresh_before_expiry=60)
+            self._download_client = SentinelHubStatisticalDownloadClient(config=self._config, session=session)
+        return self._download_client
+
+    @cached(_stats_cache, _statistics_cache_key)
     def fetch_statistics(
         self,
         bbox_coords: List[float],
@@ -107,34 +149,8 @@ class SentinelHubService:
             raise Exception("SentinelHub credentials not configured")
 
         try:
-            # Create Geometry
-            # Note: Statistical API typically requires a geometry (Polygon) or specific BBox object
             bbox = BBox(bbox=bbox_coords, crs=CRS.WGS84)
-            geometry = Geometry(bbox.geometry, crs=CRS.WGS84)
-
-
-
-
-            # Convert resolution from meters to degrees (approx) if needed
-            # 1 degree ~ 111km = 111000m at equator
-            if resolution > 1:
-                resolution = resolution / 111000.0
-
-            # Dynamic resolution scaling to respect API limit (2500px)
-            # Check dimensions in degrees
-            width_deg = bbox_coords[2] - bbox_coords[0]
-            height_deg = bbox_coords[3] - bbox_coords[1]
-            
-            # Calculate pixels
-            pixels_x = width_deg / resolution
-            pixels_y = height_deg / resolution
-            
-            limit = 2400 # slightly under 2500 to be safe
-            
-            if pixels_x > limit or pixels_y > limit:
-                scale = max(pixels_x / limit, pixels_y / limit)
-                resolution = resolution * scale
-                logger.warning(f"Resolution adjusted to {resolution:.6f} degrees to fit API limits")
+            resolution = self._compute_resolution(bbox_coords, resolution)
 
             # Execution Helper
             return self._execute_requests(bbox, time_interval, resolution)
@@ -143,48 +159,101 @@ class SentinelHubService:
             logger.error(f"Error preparing Sentinel Hub request: {e}")
             raise
 
-    def _execute_requests(self, bbox: BBox, time_interval: Tuple[str, str], resolution: float) -> Dict[str, Any]:
+    @staticmethod
+    def _compute_resolution(bbox_coords: List[float], resolution: float) -> float:
         """
-        Execute the actual requests to Sentinel Hub
+        Convert resolution to degrees and coarsen it to fit the API pixel limit.
+        
+        Args:
+            bbox_coords: [min_lon, min_lat, max_lon, max_lat]
+            resolution: Resolution in meters (values <= 1 are taken as degrees)
         """
-        stats_data = {
-            "ndvi": [],
-            "ndwi": []
-        }
-
-        # We will fetch NDVI and NDWI separately or we could try to combine them if the API allows multiple outputs
-        # For clarity and strictness, let's do two requests or one request with two calculations if script allows.
-        # Statistical API standard usually runs one script.
+        # Convert resolution from meters to degrees (approx) if needed
+        # 1 degree ~ 111km = 111000m at equator
+        if resolution > 1:
+            resolution = resolution / 111000.0
+
+        # Dynamic resolution scaling to respect API limit (2500px):
+        # the longer bbox side may span at most `limit` pixels
+        limit = 2400 # slightly under 2500 to be safe
+        max_dim = max(bbox_coords[2] - bbox_coords[0], bbox_coords[3] - bbox_coords[1])
+        min_resolution = max_dim / limit
+        
+        if resolution < min_resolution:
+            resolution = min_resolution
+            logger.warning(f"Resolution adjusted to {resolution:.6f} degrees to fit API limits")
+
+        return resolution
+
+    def search_catalog(
+        self,
+        bbox: List[float],
+        date_from: str,
+        date_to: str,
+        cloud_max: float = 100,
+        limit: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Search Sentinel-2 L2A scenes in the Sentinel Hub Catalog.
         
-        # 1. Fetch NDVI
-        logger.info("Fetching NDVI statistics...")
-        stats_ndvi = self._run_statistical_request(
-            bbox, time_interval, self.NDVI_EVALSCRIPT, "ndvi", resolution
+        Scenes are yielded as the catalog pages them in, so callers can
+        stream results without holding the whole list in memory.
+        
+        Args:
+            bbox: [min_lon, min_lat, max_lon, max_lat]
+            date_from: Start date (ISO)
+            date_to: End date (ISO)
+            cloud_max: Maximum cloud coverage percentage
+            limit: Maximum number of scenes
+        """
+        if not self._config:
+            raise Exception("SentinelHub credentials not configured")
+
+        search_iterator = self._catalog.search(
+            DataCollection.SENTINEL2_L2A,
+            bbox=BBox(bbox=bbox, crs=CRS.WGS84),
+            time=(date_from, date_to),
+            filter=f"eo:cloud_cover < {cloud_max}",
+            fields={
+                "include": ["id", "geometry", "properties.datetime", "properties.eo:cloud_cover"],
+                "exclude": []
+            }
         )
-        stats_data["ndvi"] = stats_ndvi
 
-        # 2. Fetch NDWI
-        logger.info("Fetching NDWI statistics...")
-        stats_ndwi = self._run_statistical_request(
-            bbox, time_interval, self.NDWI_EVALSCRIPT, "ndwi", resolution
+        for feature in islice(search_iterator, limit):
+            properties = feature.get("properties", {})
+            yield {
+                "id": feature["id"],
+                "acquisition_date": properties.get("datetime"),
+                "cloud_coverage": properties.get("eo:cloud_cover"),
+                "geometry": feature.get("geometry")
+            }
+
+    def _execute_requests(self, bbox: BBox, time_interval: Tuple[str, str], resolution: float) -> Dict[str, Any]:
+        """
+        Execute the actual requests to Sentinel Hub
+        """
+        logger.info("Fetching NDVI and NDWI statistics...")
+        return self._run_statistical_request(
+            bbox, time_interval, self.INDICES_EVALSCRIPT, ["ndvi", "ndwi"], resolution
         )
-        stats_data["ndwi"] = stats_ndwi
-        
-        return stats_data
 
-    def _run_statistical_request(
-        self, 
-        bbox: BBox, 
-        time_interval: Tuple[str, str], 
-        evalscript: str, 
-        output_name: str,
-        resolution: float
-    ) -> List[Dict[str, Any]]:
+    def _build_request(
+        self,
+        bbox_key: Tuple[float, float, float, float],
+        resolution: float,
+        evalscript: str
+    ) -> SentinelHubStatistical:
+        """
+        Build a Statistical API request skeleton for an AOI.
         
-        request = SentinelHubStatistical(
+        For a given bbox/resolution/evalscript only the time interval changes
+        between calls, so the skeleton is cached and specialised per call.
+        """
+        return SentinelHubStatistical(
             aggregation=SentinelHubStatistical.aggregation(
                 evalscript=evalscript,
-                time_interval=time_interval,
+                time_interval=_TEMPLATE_TIME_INTERVAL,
                 aggregation_interval="P1D",
                 resolution=(resolution, resolution)
             ),
@@ -193,57 +262,82 @@ class SentinelHubService:
                     DataCollection.SENTINEL2_L2A
                 )
             ],
-            bbox=bbox,
+            bbox=BBox(bbox=list(bbox_key), crs=CRS.WGS84),
             config=self._config
         )
 
-        data = request.get_data()
+    def _run_statistical_request(
+        self, 
+        bbox: BBox, 
+        time_interval: Tuple[str, str], 
+        evalscript: str, 
+        output_names: List[str],
+        resolution: float
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        
+        bbox_key = (bbox.min_x, bbox.min_y, bbox.max_x, bbox.max_y)
+        template = self._build_request(bbox_key, resolution, evalscript)
+
+        # Clone the cached skeleton; the payload is copied so the template stays untouched
+        request = copy.copy(template)
+        request.payload = copy.deepcopy(template.payload)
+        start_time, end_time = serialize_time(
+            parse_time_interval(time_interval, allow_undefined=True), use_tz=True
+        )
+        request.payload["aggregation"]["timeRange"] = {"from": start_time, "to": end_time}
+        request.create_request()
+
+        data = self._get_download_client().download(request.download_list, decode_data=True)
         logger.info(f"Sentinel Hub returned {len(data)} intervals. First item keys: {data[0].keys() if data else 'None'}")
         
-        # Process results
-        processed_results = []
+        # Process results, one list per evalscript output
+        processed_results = {name: [] for name in output_names}
+        appenders = [(name, processed_results[name].append) for name in output_names]
         
         for page in data:
             # The API returns a list of pages (or just one), where each item is a dict containing "data" list
-            if "data" not in page:
-                 continue
-            
-            if len(page["data"]) > 0:
-                # logger.info(f"First data item interval: {page['data'][0].get('interval')}")
-                pass
+            items = page.get("data")
+            if not items:
+                continue
 
-            for item in page["data"]:
-                if not item.get("outputs") or not item["outputs"].get(output_name):
-                    continue
-                    
-                bands_data = item["outputs"][output_name].get("bands", {})
-                if not bands_data:
-                     logger.warning(f"No bands data for {output_name}")
-                     continue
-                     
-                # Try to find the correct band name. It should be same as output_name usually, or numeric key "0"
-                # If output_name is not in keys, take the first key
-                band_key = output_name
-                if output_name not in bands_data:
-                    band_key = list(bands_data.keys())[0]
-
-                stats = bands_data.get(band_key, {}).get("stats", {})
-                
-                if not stats:
-                    continue
-                    
-                if stats.get("sampleCount", 0) == 0:
+            # Intervals still failing after the client's retries would leave
+            # gaps in the series; raise so a partial result is never cached
+            failed = [item["interval"]["from"] for item in items if item.get("error")]
+            if failed:
+                raise Exception(f"Sentinel Hub failed to process {len(failed)} interval(s), first: {failed[0]}")
+
+            for item in items:
+                outputs = item.get("outputs")
+                if not outputs:
                     continue
+
+                date = item["interval"]["from"]
+                for output_name, append in appenders:
+                    output = outputs.get(output_name)
+                    if not output:
+                        continue
+                        
+                    bands_data = output.get("bands")
+                    if not bands_data:
+                        logger.warning(f"No bands data for {output_name}")
+                        continue
+                         
+                    # Band name is usually the output name, otherwise take the first key (e.g. "B0")
+                    band = bands_data.get(output_name) or bands_data[next(iter(bands_data))]
+                    stats = band.get("stats")
                     
-                processed_results.append({
-                    "date": item["interval"]["from"],
-                    "mean": stats.get("mean"),
-                    "min": stats.get("min"),
-                    "max": stats.get("max"),
-                    "stDev": stats.get("stDev"),
-                    "percentiles": stats.get("percentiles", {}),
-                    "sample_count": stats.get("sampleCount")
-                })
+                    if not stats or not stats.get("sampleCount"):
+                        continue
+                        
+                    append({
+                        "date": date,
+                        "mean": stats.get("mean"),
+                        "min": stats.get("min"),
+                        "max": stats.get("max"),
+                        "stDev": stats.get("stDev"),
+                        "percentiles": stats.get("percentiles", {}),
+                        "sample_count": stats.get("sampleCount")
+                    })
             
         return processed_results
 
@@ -1,46 +1,184 @@
 """
 Enhanced Supabase service for database operations
 """
-from supabase import create_client, Client
+from supabase import acreate_client, AsyncClient
 from config.settings import settings
+from utils.cache import RedisCache, LayeredCache, make_cache_key
 from typing import List, Dict, Any, Optional, Tuple
-from datetime import date
+from datetime import date, datetime
+import asyncio
+import base64
 import logging
+import random
+import uuid
+import httpx
 
 logger = logging.getLogger(__name__)
 
+# Rows per bulk INSERT request, kept well under PostgREST payload limits
+INSERT_BATCH_SIZE = 500
+
+# Bulk insert chunks in flight at once; gains flatten out beyond a few
+INSERT_CONCURRENCY = 4
+
+# Retries for a bulk insert chunk that never reached the server
+INSERT_MAX_ATTEMPTS = 5
+# Failures where the request was not sent, so retrying cannot duplicate rows
+RETRYABLE_INSERT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# Columns returned by image list endpoints; leaves out the metadata JSONB
+# blob and the geography columns, which are the bulk of each row
+SATELLITE_IMAGE_LIST_COLUMNS = (
+    'id, product_id, title, acquisition_date, processing_date, cloud_coverage, '
+    'thumbnail_url, preview_url, download_url, created_at'
+)
+
+# Connection pool for PostgREST; long keep-alive so bursts of queries reuse
+# open TLS connections instead of handshaking again (httpx default is 5 s)
+POSTGREST_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=32,
+    keepalive_expiry=60
+)
+
+# Key prefix for cached satellite image list pages
+SATELLITE_LIST_CACHE_PREFIX = "sat:"
+
+_list_cache = RedisCache(settings.REDIS_URL, ttl=settings.SATELLITE_LIST_CACHE_TTL)
+
+# Cache-aside for small, read-heavy lookups; keys are versioned (v1:) so a
+# change in value shape can be rolled out by bumping the prefix
+_read_cache = LayeredCache(
+    settings.REDIS_URL,
+    l1_ttl=settings.READ_CACHE_L1_TTL,
+    l2_ttl=settings.READ_CACHE_L2_TTL,
+    max_size=settings.READ_CACHE_MAX_SIZE
+)
+DATES_CACHE_PREFIX = "v1:dates:"
+
+
+def encode_cursor(row: Dict[str, Any]) -> str:
+    """Opaque keyset cursor pointing just past row (acquisition_date, id)"""
+    raw = f"{row['acquisition_date']}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    Inverse of encode_cursor; raises ValueError on malformed input
+
+    Both parts are parsed and re-serialized, since they are interpolated
+    into a PostgREST filter and must not carry extra filter syntax.
+    """
+    try:
+        acquisition_date, image_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(acquisition_date).isoformat(), str(uuid.UUID(image_id))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
 
 class SupabaseService:
-    """Production-ready Supabase service"""
+    """
+    Production-ready Supabase service
+    
+    All queries go through a single async client so FastAPI handlers
+    never block the event loop while waiting on PostgREST.
+    """
     
     def __init__(self):
-        try:
-            self.client: Client = create_client(
-                settings.SUPABASE_URL,
-                settings.SUPABASE_SERVICE_KEY
-            )
-            logger.info("Supabase client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize Supabase client: {str(e)}")
-            raise
+        self.client: Optional[AsyncClient] = None
+        self._client_lock = asyncio.Lock()
     
-    def get_satellite_images(
+    async def _get_client(self) -> AsyncClient:
+        """Return the shared async client, creating it on first use"""
+        if self.client is None:
+            async with self._client_lock:
+                if self.client is None:
+                    try:
+                        client = await acreate_client(
+                            settings.SUPABASE_URL,
+                            settings.SUPABASE_SERVICE_KEY
+                        )
+                        await self._configure_postgrest_pool(client)
+                        self.client = client
+                        logger.info("Supabase client initialized successfully")
+                    except Exception as e:
+                        logger.error(f"Failed to initialize Supabase client: {str(e)}")
+                        raise
+        return self.client
+    
+    @staticmethod
+    async def _configure_postgrest_pool(
+        client: AsyncClient,
+        verify: bool = True,
+        proxy: Optional[str] = None
+    ) -> None:
+        """
+        Swap the PostgREST session for one using POSTGREST_LIMITS
+
+        Mirrors postgrest's create_session (HTTP/2, redirects, verify and
+        proxy as supabase passes them) and only adds the pool limits, which
+        create_session has no parameter for.
+        """
+        # HTTP/2 stays on, as in postgrest's default session: concurrent queries
+        # multiplex over few connections, and h2 already ships as a postgrest
+        # dependency (httpx[http2]). The limits cap connections for HTTP/1.1 fallback
+        postgrest = client.postgrest
+        default_session = postgrest.session
+        postgrest.session = httpx.AsyncClient(
+            base_url=default_session.base_url,
+            headers=default_session.headers,
+            timeout=default_session.timeout,
+            verify=verify,
+            proxy=proxy,
+            follow_redirects=True,
+            http2=True,
+            limits=POSTGREST_LIMITS
+        )
+        await default_session.aclose()
+    
+    async def get_satellite_images(
         self,
         date_from: Optional[str] = None,
         date_to: Optional[str] = None,
         cloud_max: Optional[float] = None,
         platform: Optional[str] = None,
         page: int = 1,
-        limit: int = 10
-    ) -> Tuple[List[Dict], int]:
+        limit: int = 10,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[int]]:
         """
         Get satellite images with filters and pagination
         
-        Returns: (data, total_count)
+        With a cursor (see encode_cursor) the page starts right after the
+        cursor row via an index seek and `page` is ignored; otherwise
+        OFFSET pagination by `page` is used.
+        
+        Returns: (data, total_count); total_count is None in cursor mode,
+        where a count would only cover the rows after the cursor
         """
+        cursor_key = decode_cursor(cursor) if cursor else None
+        position = cursor_key if cursor_key else page
+        cache_key = (
+            f"{SATELLITE_LIST_CACHE_PREFIX}"
+            f"{make_cache_key(date_from, date_to, cloud_max, platform, position)}:{limit}"
+        )
+        cached_page = await _list_cache.get(cache_key)
+        if cached_page is not None:
+            data, total = cached_page
+            return data, total
+        
         try:
+            client = await self._get_client()
             # Build query
-            query = self.client.table('satellite_images').select('*', count='exact')
+            # 'estimated': PostgREST counts exactly up to its max-rows limit and
+            # falls back to the planner's row estimate beyond it, so large
+            # filtered sets don't pay for a full COUNT(*) on every page.
+            # Cursor pages skip the count, which would only cover later rows
+            query = client.table('satellite_images').select(
+                SATELLITE_IMAGE_LIST_COLUMNS,
+                count=None if cursor_key else 'estimated'
+            )
             
             # Apply filters
             if date_from:
@@ -52,62 +190,138 @@ class SupabaseService:
             if platform:
                 query = query.eq('platform', platform)
             
-            # Get total count
-            count_response = query.execute()
-            total = count_response.count if hasattr(count_response, 'count') else 0
-            
-            # Apply pagination and ordering
-            offset = (page - 1) * limit
-            query = query.order('acquisition_date', desc=True).range(offset, offset + limit - 1)
-            
-            response = query.execute()
+            # Apply pagination and ordering (id breaks ties between equal dates);
+            # PostgREST returns the total count alongside the page rows
+            query = query.order('acquisition_date', desc=True).order('id', desc=True)
+            if cursor_key:
+                last_date, last_id = cursor_key
+                query = query.or_(
+                    f'acquisition_date.lt."{last_date}",'
+                    f'and(acquisition_date.eq."{last_date}",id.lt.{last_id})'
+                ).limit(limit)
+            else:
+                offset = (page - 1) * limit
+                query = query.range(offset, offset + limit - 1)
+            
+            response = await query.execute()
+            total = None if cursor_key else response.count or 0
             
             logger.info(f"Retrieved {len(response.data)} satellite images (total: {total})")
+            await _list_cache.set(cache_key, (response.data, total))
             return response.data, total
             
         except Exception as e:
             logger.error(f"Error fetching satellite images: {str(e)}")
             raise
     
-    def get_satellite_image_by_id(self, image_id: str) -> Optional[Dict]:
-        """Get single satellite image by ID"""
+    async def get_satellite_image_by_id(self, image_id: str, columns: str = '*') -> Optional[Dict]:
+        """Get single satellite image by ID, projecting only `columns`"""
         try:
-            response = self.client.table('satellite_images')\
-                .select('*')\
-                .eq('id', image_id)\
-                .single()\
-                .execute()
-            
-            return response.data if response.data else None
+            return await _read_cache.get_or_load(
+                f"v1:image:{image_id}:{columns}",
+                lambda: self._load_satellite_image(image_id, columns)
+            )
             
         except Exception as e:
             logger.error(f"Error fetching image {image_id}: {str(e)}")
             return None
     
-    def insert_satellite_image(self, data: Dict[str, Any]) -> Dict:
-        """Insert new satellite image"""
+    async def _load_satellite_image(self, image_id: str, columns: str) -> Optional[Dict]:
+        client = await self._get_client()
+        # maybe_single: a missing row is a normal None, not an error
+        response = await client.table('satellite_images')\
+            .select(columns)\
+            .eq('id', image_id)\
+            .maybe_single()\
+            .execute()
+        
+        return response.data if response and response.data else None
+    
+    async def _insert_batch(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        on_conflict: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Insert rows in chunks of INSERT_BATCH_SIZE, one request per chunk
+        
+        Up to INSERT_CONCURRENCY chunks are sent concurrently; returned rows
+        keep the input order. Connection failures are retried with jittered
+        exponential backoff, anything else is raised once every chunk has
+        finished, so callers can rely on no insert still being in flight.
+        With on_conflict set, rows are upserted on those columns instead.
+        """
+        client = await self._get_client()
+        semaphore = asyncio.Semaphore(INSERT_CONCURRENCY)
+        
+        async def send(chunk: List[Dict[str, Any]]) -> List[Dict]:
+            table = client.table(table_name)
+            if on_conflict:
+                query = table.upsert(chunk, on_conflict=on_conflict)
+            else:
+                query = table.insert(chunk)
+            async with semaphore:
+                for attempt in range(INSERT_MAX_ATTEMPTS):
+                    try:
+                        response = await query.execute()
+                        return response.data or []
+                    except RETRYABLE_INSERT_ERRORS as e:
+                        if attempt == INSERT_MAX_ATTEMPTS - 1:
+                            raise
+                        delay = 2 ** attempt + random.random()
+                        logger.warning(
+                            f"Insert into {table_name} failed ({str(e)}), "
+                            f"retrying in {delay:.1f}s ({attempt + 1}/{INSERT_MAX_ATTEMPTS})"
+                        )
+                        await asyncio.sleep(delay)
+        
+        results = await asyncio.gather(*[
+            send(rows[start:start + INSERT_BATCH_SIZE])
+            for start in range(0, len(rows), INSERT_BATCH_SIZE)
+        ], return_exceptions=True)
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            logger.error(f"{len(errors)} of {len(results)} chunks failed for {table_name}")
+            raise errors[0]
+        return [row for chunk_rows in results for row in chunk_rows]
+    
+    async def insert_satellite_images_bulk(self, rows: List[Dict[str, Any]]) -> List[Dict]:
+        """Insert multiple satellite images using bulk requests"""
         try:
-            response = self.client.table('satellite_images')\
-                .insert(data)\
-                .execute()
+            inserted = await self._insert_batch('satellite_images', rows)
             
-            logger.info(f"Inserted satellite image: {data.get('product_id')}")
-            return response.data[0] if response.data else {}
+            logger.info(f"Inserted {len(inserted)} satellite images")
+            return inserted
             
         except Exception as e:
-            logger.error(f"Error inserting satellite image: {str(e)}")
+            logger.error(f"Error inserting satellite images: {str(e)}")
             raise
+        finally:
+            # Chunks that did succeed are visible even if another one failed
+            await _list_cache.delete_prefix(SATELLITE_LIST_CACHE_PREFIX)
+    
+    async def insert_satellite_image(self, data: Dict[str, Any]) -> Dict:
+        """Insert new satellite image"""
+        inserted = await self.insert_satellite_images_bulk([data])
+        return inserted[0] if inserted else {}
     
-    def delete_satellite_image(self, image_id: str) -> bool:
+    async def delete_satellite_image(self, image_id: str) -> bool:
         """Delete satellite image by ID"""
         try:
-            response = self.client.table('satellite_images')\
+            client = await self._get_client()
+            response = await client.table('satellite_images')\
                 .delete()\
                 .eq('id', image_id)\
                 .execute()
             
             success = len(response.data) > 0
             if success:
+                await _list_cache.delete_prefix(SATELLITE_LIST_CACHE_PREFIX)
+                await _read_cache.delete_prefix(f"v1:image:{image_id}:")
+                await _read_cache.delete(
+                    f"v1:ndvi:{image_id}", f"v1:ndwi:{image_id}", f"v1:has_indices:{image_id}"
+                )
                 logger.info(f"Deleted satellite image: {image_id}")
             return success
             
@@ -115,7 +329,7 @@ class SupabaseService:
             logger.error(f"Error deleting image {image_id}: {str(e)}")
             raise
     
-    def get_images_in_bounds(
+    async def get_images_in_bounds(
         self,
         min_lat: float,
         max_lat: float,
@@ -126,51 +340,40 @@ class SupabaseService:
         cloud_max: float = 30,
         limit: int = 100
     ) -> List[Dict]:
-        """Get images within bounding box using PostGIS (or simple filter)"""
+        """Get images within bounding box using the images_in_bounds PostGIS RPC"""
         try:
-            # Build query with joins to get statistics
-            query = self.client.table('satellite_images').select(
-                '*, ndvi_data(ndvi_mean, vegetation_category), ndwi_data(ndwi_mean, water_category)'
-            )
-            
-            # Date filters
-            if date_from:
-                query = query.gte('acquisition_date', str(date_from))
-            if date_to:
-                query = query.lte('acquisition_date', str(date_to))
-                
-            # Cloud filter
-            query = query.lte('cloud_coverage', cloud_max)
-            
-            # Simple bounds check using RPC if available, or just filtering 
-            # (Supabase/PostgREST doesn't support complex PostGIS queries directly in table interface without RPC)
-            # For now, we will return matches and let frontend settle, OR rely on 'search_by_bounds' RPC if we had it.
-            # Assuming user manually loaded data, we will just return date/cloud filtered data for now 
-            # and sort by date.
-            
-            query = query.order('acquisition_date', desc=True).limit(limit)
-            
-            response = query.execute()
-            
-            # Filter by simple coordinate box in Python if center_point is available
-            # This is a fallback until PostGIS RPC is set up
-            results = []
-            if response.data:
-                for img in response.data:
-                    # Parse center point if possible, or just include
-                    results.append(img)
-            
-            logger.info(f"Retrieved {len(results)} images from DB (filtered by date/cloud)")
+            client = await self._get_client()
+            # Spatial, cloud and date filters run server-side against the GiST
+            # indexes; the select embeds the index statistics for each image.
+            # center_point is needed too: rows without bounds match on it
+            response = await client.rpc('images_in_bounds', {
+                'min_lat': min_lat,
+                'max_lat': max_lat,
+                'min_lon': min_lon,
+                'max_lon': max_lon,
+                'cloud_max': cloud_max,
+                'lim': limit,
+                'date_from': str(date_from) if date_from else None,
+                'date_to': str(date_to) if date_to else None
+            }).select(
+                f'{SATELLITE_IMAGE_LIST_COLUMNS}, bounds, center_point, '
+                'ndvi_data(ndvi_mean, vegetation_category), ndwi_data(ndwi_mean, water_category)'
+            ).execute()
+            
+            results = response.data or []
+            
+            logger.info(f"Retrieved {len(results)} images in bounds from DB")
             return results
             
         except Exception as e:
             logger.error(f"Error fetching images in bounds: {str(e)}")
             raise
     
-    def get_statistics(self, image_id: str) -> Optional[Dict]:
+    async def get_statistics(self, image_id: str) -> Optional[Dict]:
         """Get statistics for an image"""
         try:
-            response = self.client.table('statistics')\
+            client = await self._get_client()
+            response = await client.table('statistics')\
                 .select('*')\
                 .eq('image_id', image_id)\
                 .execute()
@@ -181,21 +384,24 @@ class SupabaseService:
             logger.error(f"Error fetching statistics for {image_id}: {str(e)}")
             return None
     
-    def insert_statistics(self, data: Dict[str, Any]) -> Dict:
-        """Insert statistics for an image"""
+    async def insert_statistics_bulk(self, rows: List[Dict[str, Any]]) -> List[Dict]:
+        """Insert statistics for multiple images using bulk requests"""
         try:
-            response = self.client.table('statistics')\
-                .insert(data)\
-                .execute()
+            inserted = await self._insert_batch('statistics', rows)
             
-            logger.info(f"Inserted statistics for image: {data.get('image_id')}")
-            return response.data[0] if response.data else {}
+            logger.info(f"Inserted statistics for {len(inserted)} images")
+            return inserted
             
         except Exception as e:
             logger.error(f"Error inserting statistics: {str(e)}")
             raise
     
-    def get_timeseries_data(
+    async def insert_statistics(self, data: Dict[str, Any]) -> Dict:
+        """Insert statistics for an image"""
+        inserted = await self.insert_statistics_bulk([data])
+        return inserted[0] if inserted else {}
+    
+    async def get_timeseries_data(
         self,
         area_name: str,
         date_from: Optional[date] = None,
@@ -204,7 +410,8 @@ class SupabaseService:
     ) -> List[Dict]:
         """Get time series data for an area"""
         try:
-            query = self.client.table('satellite_images')\
+            client = await self._get_client()
+            query = client.table('satellite_images')\
                 .select('acquisition_date, cloud_coverage')\
                 .order('acquisition_date', desc=False)\
                 .limit(limit)
@@ -214,7 +421,7 @@ class SupabaseService:
             if date_to:
                 query = query.lte('acquisition_date', str(date_to))
             
-            response = query.execute()
+            response = await query.execute()
             
             logger.info(f"Retrieved {len(response.data)} time series points")
             return response.data
@@ -223,7 +430,7 @@ class SupabaseService:
             logger.error(f"Error fetching time series: {str(e)}")
             raise
     
-    def get_area_summary(
+    async def get_area_summary(
         self,
         min_lat: float,
         max_lat: float,
@@ -232,40 +439,34 @@ class SupabaseService:
         date_from: Optional[date] = None,
         date_to: Optional[date] = None
     ) -> Dict:
-        """Get summary statistics for an area"""
+        """Get summary statistics for an area (aggregated in Postgres via RPC)"""
         try:
-            # For MVP, return basic aggregated data
-            query = self.client.table('satellite_images').select('*')
-            
-            if date_from:
-                query = query.gte('acquisition_date', str(date_from))
-            if date_to:
-                query = query.lte('acquisition_date', str(date_to))
-            
-            response = query.execute()
+            client = await self._get_client()
+            response = await client.rpc('area_summary', {
+                'min_lat': min_lat,
+                'max_lat': max_lat,
+                'min_lon': min_lon,
+                'max_lon': max_lon,
+                'date_from': str(date_from) if date_from else None,
+                'date_to': str(date_to) if date_to else None
+            }).execute()
             data = response.data
             
-            if not data:
+            total = data.get('total_images', 0) if data else 0
+            if not total:
                 return {
                     "total_images": 0,
                     "average_cloud_coverage": 0,
                     "date_range": None
                 }
             
-            # Calculate summary
-            total = len(data)
-            avg_cloud = sum(img.get('cloud_coverage', 0) for img in data) / total if total > 0 else 0
-            
-            dates = [img['acquisition_date'] for img in data if 'acquisition_date' in img]
-            date_range = {
-                "start": min(dates) if dates else None,
-                "end": max(dates) if dates else None
-            }
-            
             summary = {
                 "total_images": total,
-                "average_cloud_coverage": round(avg_cloud, 2),
-                "date_range": date_range,
+                "average_cloud_coverage": round(float(data['average_cloud_coverage']), 2),
+                "date_range": {
+                    "start": data.get('date_start'),
+                    "end": data.get('date_end')
+                },
                 "vegetation_health": "moderate"  # TODO: Calculate from NDVI
             }
             
@@ -276,95 +477,173 @@ class SupabaseService:
             logger.error(f"Error generating area summary: {str(e)}")
             raise
     
-    def insert_region_statistics(self, data: Dict[str, Any]) -> Dict:
-        """Insert region statistics (NDVI/NDWI)"""
+    async def insert_region_statistics_bulk(self, rows: List[Dict[str, Any]]) -> List[Dict]:
+        """Insert multiple region statistics rows using bulk requests"""
         try:
-            response = self.client.table('region_statistics')\
-                .insert(data)\
-                .execute()
+            inserted = await self._insert_batch('region_statistics', rows)
             
-            logger.info(f"Inserted statistics for {data.get('region_name')} on {data.get('date')}")
-            return response.data[0] if response.data else {}
+            logger.info(f"Inserted {len(inserted)} region statistics rows")
+            return inserted
             
         except Exception as e:
             logger.error(f"Error inserting region statistics: {str(e)}")
             raise
+    
+    async def insert_region_statistics(self, data: Dict[str, Any]) -> Dict:
+        """Insert region statistics (NDVI/NDWI)"""
+        inserted = await self.insert_region_statistics_bulk([data])
+        return inserted[0] if inserted else {}
 
-    def insert_ndvi_data(self, data: Dict[str, Any]) -> Dict:
-        """Insert NDVI calculation data"""
+    async def upsert_region_statistics_bulk(
+        self,
+        rows: List[Dict[str, Any]],
+        on_conflict: str = 'region_name, date'
+    ) -> List[Dict]:
+        """Insert or update multiple region statistics rows on the given conflict columns"""
+        try:
+            upserted = await self._insert_batch('region_statistics', rows, on_conflict=on_conflict)
+            
+            return upserted
+            
+        except Exception as e:
+            logger.error(f"Error upserting region statistics: {str(e)}")
+            raise
+
+    async def upsert_region_statistics(
+        self,
+        data: Dict[str, Any],
+        on_conflict: str = 'region_name, date'
+    ) -> Dict:
+        """Insert or update region statistics on the given conflict columns"""
+        upserted = await self.upsert_region_statistics_bulk([data], on_conflict=on_conflict)
+        return upserted[0] if upserted else {}
+    
+    async def delete_region_statistics(self, region_name: str) -> int:
+        """Delete all statistics stored for a region"""
         try:
-            response = self.client.table('ndvi_data')\
-                .insert(data)\
+            client = await self._get_client()
+            response = await client.table('region_statistics')\
+                .delete()\
+                .eq('region_name', region_name)\
                 .execute()
             
-            logger.info(f"Inserted NDVI data for image: {data.get('image_id')}")
-            return response.data[0] if response.data else {}
+            return len(response.data or [])
+            
+        except Exception as e:
+            logger.error(f"Error deleting region statistics for {region_name}: {str(e)}")
+            raise
+
+    async def refresh_region_stats_dates(self) -> None:
+        """
+        Rebuild the region_stats_dates view after writing region statistics
+
+        Call once per batch of writes; the region statistics write methods
+        leave the view (and the available-dates cache) stale until then.
+        """
+        try:
+            client = await self._get_client()
+            await client.rpc('refresh_region_stats_dates', {}).execute()
+            await _read_cache.delete_prefix(DATES_CACHE_PREFIX)
+            
+        except Exception as e:
+            logger.error(f"Error refreshing region_stats_dates: {str(e)}")
+            raise
+
+    async def insert_ndvi_data_bulk(self, rows: List[Dict[str, Any]]) -> List[Dict]:
+        """Insert NDVI data for multiple images using bulk requests"""
+        try:
+            inserted = await self._insert_batch('ndvi_data', rows)
+            
+            logger.info(f"Inserted NDVI data for {len(inserted)} images")
+            return inserted
             
         except Exception as e:
             logger.error(f"Error inserting NDVI data: {str(e)}")
             raise
+        finally:
+            # Chunks that did succeed are visible even if another one failed
+            image_ids = {row.get('image_id') for row in rows}
+            await _read_cache.delete(
+                *[f"v1:ndvi:{image_id}" for image_id in image_ids],
+                *[f"v1:has_indices:{image_id}" for image_id in image_ids]
+            )
     
-    def insert_ndwi_data(self, data: Dict[str, Any]) -> Dict:
-        """Insert NDWI calculation data"""
+    async def insert_ndvi_data(self, data: Dict[str, Any]) -> Dict:
+        """Insert NDVI calculation data"""
+        inserted = await self.insert_ndvi_data_bulk([data])
+        return inserted[0] if inserted else {}
+    
+    async def insert_ndwi_data_bulk(self, rows: List[Dict[str, Any]]) -> List[Dict]:
+        """Insert NDWI data for multiple images using bulk requests"""
         try:
-            response = self.client.table('ndwi_data')\
-                .insert(data)\
-                .execute()
+            inserted = await self._insert_batch('ndwi_data', rows)
             
-            logger.info(f"Inserted NDWI data for image: {data.get('image_id')}")
-            return response.data[0] if response.data else {}
+            logger.info(f"Inserted NDWI data for {len(inserted)} images")
+            return inserted
             
         except Exception as e:
             logger.error(f"Error inserting NDWI data: {str(e)}")
             raise
+        finally:
+            # Chunks that did succeed are visible even if another one failed
+            image_ids = {row.get('image_id') for row in rows}
+            await _read_cache.delete(
+                *[f"v1:ndwi:{image_id}" for image_id in image_ids],
+                *[f"v1:has_indices:{image_id}" for image_id in image_ids]
+            )
     
-    def get_ndvi_data(self, image_id: str) -> Optional[Dict]:
+    async def insert_ndwi_data(self, data: Dict[str, Any]) -> Dict:
+        """Insert NDWI calculation data"""
+        inserted = await self.insert_ndwi_data_bulk([data])
+        return inserted[0] if inserted else {}
+    
+    async def _load_index_row(self, table_name: str, image_id: str) -> Optional[Dict]:
+        client = await self._get_client()
+        response = await client.table(table_name)\
+            .select('*')\
+            .eq('image_id', image_id)\
+            .execute()
+        
+        return response.data[0] if response.data else None
+    
+    async def get_ndvi_data(self, image_id: str) -> Optional[Dict]:
         """Get NDVI data for an image"""
         try:
-            response = self.client.table('ndvi_data')\
-                .select('*')\
-                .eq('image_id', image_id)\
-                .execute()
-            
-            return response.data[0] if response.data else None
+            return await _read_cache.get_or_load(
+                f"v1:ndvi:{image_id}",
+                lambda: self._load_index_row('ndvi_data', image_id)
+            )
             
         except Exception as e:
             logger.error(f"Error fetching NDVI data for {image_id}: {str(e)}")
             return None
     
-    def get_ndwi_data(self, image_id: str) -> Optional[Dict]:
+    async def get_ndwi_data(self, image_id: str) -> Optional[Dict]:
         """Get NDWI data for an image"""
         try:
-            response = self.client.table('ndwi_data')\
-                .select('*')\
-                .eq('image_id', image_id)\
-                .execute()
-            
-            return response.data[0] if response.data else None
+            return await _read_cache.get_or_load(
+                f"v1:ndwi:{image_id}",
+                lambda: self._load_index_row('ndwi_data', image_id)
+            )
             
         except Exception as e:
             logger.error(f"Error fetching NDWI data for {image_id}: {str(e)}")
             return None
     
-    def get_latest_processed_date(self) -> Optional[str]:
+    async def get_latest_processed_date(self) -> Optional[str]:
         """Get the acquisition date of the latest processed image"""
         try:
-            response = self.client.table('satellite_images')\
-                .select('acquisition_date')\
-                .order('acquisition_date', desc=True)\
-                .limit(1)\
-                .execute()
+            client = await self._get_client()
+            response = await client.rpc('latest_acquisition_date').execute()
             
-            if response.data:
-                return response.data[0].get('acquisition_date')
-            return None
+            return response.data or None
             
         except Exception as e:
             logger.error(f"Error fetching latest processed date: {str(e)}")
             return None
     
     
-    def get_region_statistics_geojson(
+    async def get_region_statistics_geojson(
         self,
         date: str,
         index_type: str,
@@ -373,20 +652,15 @@ class SupabaseService:
         """
         Get region statistics as GeoJSON FeatureCollection
         
-        Converts PostGIS bbox to GeoJSON geometry
+        PostGIS converts bbox to GeoJSON in the same query
         """
         try:
-            # Build query
-            query = self.client.table('region_statistics').select('*')
-            
-            # Apply filters
-            query = query.eq('date', date)
-            query = query.eq('index_type', index_type)
-            
-            if region_name:
-                query = query.eq('region_name', region_name)
-            
-            response = query.execute()
+            client = await self._get_client()
+            response = await client.rpc('region_statistics_geojson', {
+                'target_date': date,
+                'target_index_type': index_type,
+                'target_region': region_name
+            }).execute()
             
             if not response.data:
                 logger.warning(f"No data found for date={date}, index={index_type}")
@@ -395,31 +669,9 @@ class SupabaseService:
             # Convert to GeoJSON
             features = []
             for row in response.data:
-                # Use PostGIS function to convert bbox to GeoJSON
-                # The bbox is stored as GEOGRAPHY(POLYGON)
-                try:
-                    geom_query = self.client.rpc(
-                        'st_asgeojson',
-                        {'geom': row['bbox']}
-                    ).execute()
-                    
-                    # RPC returns JSON string, need to parse it
-                    import json
-                    geometry = json.loads(geom_query.data) if geom_query.data else None
-                    
-                except Exception as e:
-                    logger.warning(f"Error converting bbox to GeoJSON: {str(e)}")
-                    geometry = None
-                
-                # Fallback: if RPC doesn't work, try to parse bbox manually
-                if not geometry and row.get('bbox'):
-                    # bbox is in WKB format, we need to convert it
-                    # For now, return a simple structure
-                    logger.warning(f"Could not convert bbox to GeoJSON for row {row['id']}")
-                    geometry = {
-                        "type": "Polygon",
-                        "coordinates": [[]]  # Empty for now
-                    }
+                geometry = row['geometry']
+                if not geometry:
+                    logger.warning(f"Region statistics row {row['id']} has no bbox")
                 
                 feature = {
                     "type": "Feature",
@@ -450,33 +702,42 @@ class SupabaseService:
             logger.error(f"Error getting region statistics as GeoJSON: {str(e)}")
             raise
     
-    def get_available_dates(
+    async def get_available_dates(
         self,
         index_type: Optional[str] = None,
         region_name: Optional[str] = None
     ) -> List[str]:
         """Get list of available dates in region_statistics"""
         try:
-            query = self.client.table('region_statistics').select('date')
-            
-            if index_type:
-                query = query.eq('index_type', index_type)
-            if region_name:
-                query = query.eq('region_name', region_name)
-            
-            response = query.execute()
-            
-            # Get unique dates and sort
-            dates = sorted(set(row['date'] for row in response.data if 'date' in row))
-            
-            # logger.info(f"Found {len(dates)} available dates")
-            return dates
+            return await _read_cache.get_or_load(
+                f"{DATES_CACHE_PREFIX}{index_type}:{region_name}",
+                lambda: self._load_available_dates(index_type, region_name)
+            )
             
         except Exception as e:
             logger.error(f"Error fetching available dates: {str(e)}")
             raise
 
-    def get_region_statistics_timeseries(
+    async def _load_available_dates(
+        self,
+        index_type: Optional[str],
+        region_name: Optional[str]
+    ) -> List[str]:
+        client = await self._get_client()
+        # Materialized view holds one row per (date, index_type, region_name)
+        query = client.table('region_stats_dates').select('date')
+        
+        if index_type:
+            query = query.eq('index_type', index_type)
+        if region_name:
+            query = query.eq('region_name', region_name)
+        
+        response = await query.order('date').execute()
+        
+        # Rows are sorted; drop repeats left when a filter is not set
+        return list(dict.fromkeys(row['date'] for row in response.data))
+
+    async def get_region_statistics_timeseries(
         self,
         region_name: str,
         index_type: str,
@@ -486,8 +747,9 @@ class SupabaseService:
     ) -> List[Dict]:
         """Get timeseries data for region and index"""
         try:
-            query = self.client.table('region_statistics')\
-                .select('*')\
+            client = await self._get_client()
+            query = client.table('region_statistics')\
+                .select('date, index_type, mean, min, max, std, sample_count')\
                 .eq('region_name', region_name)\
                 .eq('index_type', index_type)\
                 .order('date', desc=False)
@@ -500,7 +762,7 @@ class SupabaseService:
             if limit:
                 query = query.limit(limit)
                 
-            response = query.execute()
+            response = await query.execute()
             return response.data
             
         except Exception as e:
@@ -508,18 +770,26 @@ class SupabaseService:
             raise
 
     
-    def check_image_has_indices(self, image_id: str) -> Dict[str, bool]:
-
+    async def _load_indices_status(self, image_id: str) -> Dict[str, bool]:
+        client = await self._get_client()
+        response = await client.rpc('image_has_indices', {'iid': image_id}).execute()
+        row = response.data[0] if response.data else {}
+        
+        has_ndvi = bool(row.get('has_ndvi'))
+        has_ndwi = bool(row.get('has_ndwi'))
+        return {
+            "has_ndvi": has_ndvi,
+            "has_ndwi": has_ndwi,
+            "has_both": has_ndvi and has_ndwi
+        }
+    
+    async def check_image_has_indices(self, image_id: str) -> Dict[str, bool]:
         """Check if image has NDVI and NDWI data calculated"""
         try:
-            has_ndvi = self.get_ndvi_data(image_id) is not None
-            has_ndwi = self.get_ndwi_data(image_id) is not None
-            
-            return {
-                "has_ndvi": has_ndvi,
-                "has_ndwi": has_ndwi,
-                "has_both": has_ndvi and has_ndwi
-            }
+            return await _read_cache.get_or_load(
+                f"v1:has_indices:{image_id}",
+                lambda: self._load_indices_status(image_id)
+            )
             
         except Exception as e:
             logger.error(f"Error checking indices for {image_id}: {str(e)}")
@@ -0,0 +1,189 @@
+"""
+Caching helpers for expensive remote API calls
+"""
+import hashlib
+import logging
+import threading
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+import diskcache
+import orjson
+import redis.asyncio as aioredis
+from cachetools import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable SHA1 cache key from JSON-serializable parts"""
+    payload = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.sha1(payload).hexdigest()
+
+
+class TwoTierCache:
+    """
+    In-memory TTL cache in front of a persistent on-disk cache
+
+    The memory tier serves hot keys within a process, the disk tier
+    survives restarts and is shared between processes on the same host.
+    """
+
+    def __init__(self, directory: str, ttl: int, max_size: int):
+        self.ttl = ttl
+        self._memory = TTLCache(maxsize=max_size, ttl=ttl)
+        self._lock = threading.Lock()
+        self._disk = diskcache.Cache(directory)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            value = self._memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        value = self._disk.get(key, default=_MISSING)
+        if value is _MISSING:
+            return default
+
+        with self._lock:
+            self._memory[key] = value
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._memory[key] = value
+        self._disk.set(key, value, expire=self.ttl)
+
+
+class RedisCache:
+    """
+    Async Redis cache shared between workers
+
+    Disabled when no URL is configured. Redis errors are logged and treated
+    as misses, so the database stays the source of truth.
+    """
+
+    def __init__(self, url: str, ttl: int):
+        self.ttl = ttl
+        self._client = aioredis.from_url(url) if url else None
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        if self._client is None:
+            return default
+        try:
+            raw = await self._client.get(key)
+        except Exception as e:
+            logger.warning(f"Redis GET failed for {key}: {str(e)}")
+            return default
+        return orjson.loads(raw) if raw is not None else default
+
+    async def set(self, key: str, value: Any) -> None:
+        if self._client is None:
+            return
+        try:
+            await self._client.setex(key, self.ttl, orjson.dumps(value))
+        except Exception as e:
+            logger.warning(f"Redis SETEX failed for {key}: {str(e)}")
+
+    async def delete(self, *keys: str) -> None:
+        if self._client is None or not keys:
+            return
+        try:
+            await self._client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis DEL failed for {keys}: {str(e)}")
+
+    async def delete_prefix(self, prefix: str) -> None:
+        """Drop every key starting with prefix (SCAN + DEL, non-blocking)"""
+        if self._client is None:
+            return
+        try:
+            keys = [key async for key in self._client.scan_iter(match=f"{prefix}*")]
+            if keys:
+                await self._client.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Redis invalidation failed for {prefix}*: {str(e)}")
+
+
+class LayeredCache:
+    """
+    In-process TTL cache (L1) in front of Redis (L2) for async readers
+
+    L1 absorbs repeat reads within a worker, L2 is shared between workers.
+    Invalidation only reaches this worker's L1, so the L1 TTL bounds how
+    stale other workers can be.
+    """
+
+    def __init__(self, redis_url: str, l1_ttl: int, l2_ttl: int, max_size: int):
+        self._memory = TTLCache(maxsize=max_size, ttl=l1_ttl)
+        self._redis = RedisCache(redis_url, ttl=l2_ttl)
+
+    async def get(self, key: str, default: Any = None) -> Any:
+        value = self._memory.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        value = await self._redis.get(key, _MISSING)
+        if value is _MISSING:
+            return default
+
+        self._memory[key] = value
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        await self._redis.set(key, value)
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Return the cached value or await loader() and cache its result
+
+        None results and exceptions are not cached, so misses are
+        re-checked against the database on the next call.
+        """
+        value = await self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        value = await loader()
+        if value is not None:
+            await self.set(key, value)
+        return value
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._memory.pop(key, None)
+        await self._redis.delete(*keys)
+
+    async def delete_prefix(self, prefix: str) -> None:
+        for key in [k for k in list(self._memory) if k.startswith(prefix)]:
+            self._memory.pop(key, None)
+        await self._redis.delete_prefix(prefix)
+
+
+def cached(cache: TwoTierCache, key_func: Callable[..., str]):
+    """
+    Decorator caching a function's result under key_func(*args, **kwargs)
+
+    Exceptions are not cached, so failed calls are retried next time.
+    A key_func returning None bypasses the cache for that call.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = key_func(*args, **kwargs)
+            if key is None:
+                return func(*args, **kwargs)
+
+            value = cache.get(key, _MISSING)
+            if value is not _MISSING:
+                logger.debug(f"Cache hit for {func.__name__} ({key})")
+                return value
+
+            value = func(*args, **kwargs)
+            cache.set(key, value)
+            return value
+        return wrapper
+    return decorator
@@ -3,6 +3,19 @@ Standardized API response formatters
 """
 from typing import Any, Optional, Dict, List
 from datetime import datetime
+import time
+
+# Last formatted timestamp, reused for every response within the same second
+_ts_cache = {"sec": 0, "iso": ""}
+
+
+def _now_iso() -> str:
+    """Current UTC time in ISO format, truncated to whole seconds"""
+    sec = int(time.time())
+    if sec != _ts_cache["sec"]:
+        _ts_cache["iso"] = datetime.utcfromtimestamp(sec).isoformat()
+        _ts_cache["sec"] = sec
+    return _ts_cache["iso"]
 
 
 def success_response(
@@ -25,7 +38,7 @@ def success_response(
         "success": True,
         "message": message,
         "data": data,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
     
     if meta:
@@ -39,7 +52,8 @@ def paginated_response(
     page: int,
     limit: int,
     total: int,
-    message: str = "Success"
+    message: str = "Success",
+    next_cursor: Optional[str] = None
 ) -> Dict:
     """
     Format paginated API response
@@ -50,28 +64,89 @@ def paginated_response(
         limit: Items per page
         total: Total number of items
         message: Success message
+        next_cursor: Keyset cursor for the following page, if any
     
     Returns:
         Formatted response with pagination metadata
     """
     total_pages = (total + limit - 1) // limit  # Ceiling division
     
+    pagination = {
+        "page": page,
+        "limit": limit,
+        "total": total,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_prev": page > 1
+    }
+    if next_cursor:
+        pagination["next_cursor"] = next_cursor
+    
+    return success_response(
+        data=data,
+        message=message,
+        meta={"pagination": pagination}
+    )
+
+
+def cursor_paginated_response(
+    data: List[Any],
+    limit: int,
+    next_cursor: Optional[str],
+    message: str = "Success"
+) -> Dict:
+    """
+    Format a keyset (cursor) paginated API response
+    
+    Cursor pages have no page number or total, so the metadata only says
+    whether another page follows and how to request it.
+    
+    Args:
+        data: List of items
+        limit: Items per page
+        next_cursor: Keyset cursor for the following page, if any
+        message: Success message
+    
+    Returns:
+        Formatted response with cursor pagination metadata
+    """
+    pagination = {
+        "limit": limit,
+        "has_next": next_cursor is not None
+    }
+    if next_cursor:
+        pagination["next_cursor"] = next_cursor
+    
     return success_response(
         data=data,
         message=message,
-        meta={
-            "pagination": {
-                "page": page,
-                "limit": limit,
-                "total": total,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
-            }
-        }
+        meta={"pagination": pagination}
     )
 
 
+def to_soa(rows: List[Dict], columns: Optional[List[str]] = None) -> Dict:
+    """
+    Convert a list of row dicts to a columnar {"columns", "rows"} shape
+    
+    Key names are sent once instead of once per row, which makes wide
+    list payloads noticeably smaller.
+    
+    Args:
+        rows: List of row dicts
+        columns: Column order (defaults to the keys of the first row)
+    
+    Returns:
+        Dict with column names and rows as value lists
+    """
+    if columns is None:
+        columns = list(rows[0].keys()) if rows else []
+    
+    return {
+        "columns": columns,
+        "rows": [[row.get(column) for column in columns] for row in rows]
+    }
+
+
 def error_response(
     error: str,
     message: str,
@@ -95,7 +170,7 @@ def error_response(
         "error": error,
         "message": message,
         "status_code": status_code,
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _now_iso()
     }
     
     if details:
@@ -1,7 +1,7 @@
 """
 Request validators using Pydantic
 """
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
 from typing import Optional, List, Tuple
 from datetime import datetime, date
 
@@ -11,9 +11,10 @@ class DateRangeValidator(BaseModel):
     date_from: date = Field(..., description="Start date (YYYY-MM-DD)")
     date_to: date = Field(..., description="End date (YYYY-MM-DD)")
     
-    @validator('date_to')
-    def validate_date_range(cls, v, values):
-        if 'date_from' in values and v < values['date_from']:
+    @field_validator('date_to')
+    @classmethod
+    def validate_date_range(cls, v, info: ValidationInfo):
+        if 'date_from' in info.data and v < info.data['date_from']:
             raise ValueError('date_to must be after date_from')
         return v
 
@@ -25,15 +26,17 @@ class BoundingBoxValidator(BaseModel):
     min_lon: float = Field(..., ge=-180, le=180, description="Minimum longitude")
     max_lon: float = Field(..., ge=-180, le=180, description="Maximum longitude")
     
-    @validator('max_lat')
-    def validate_lat_range(cls, v, values):
-        if 'min_lat' in values and v <= values['min_lat']:
+    @field_validator('max_lat')
+    @classmethod
+    def validate_lat_range(cls, v, info: ValidationInfo):
+        if 'min_lat' in info.data and v <= info.data['min_lat']:
             raise ValueError('max_lat must be greater than min_lat')
         return v
     
-    @validator('max_lon')
-    def validate_lon_range(cls, v, values):
-        if 'min_lon' in values and v <= values['min_lon']:
+    @field_validator('max_lon')
+    @classmethod
+    def validate_lon_range(cls, v, info: ValidationInfo):
+        if 'min_lon' in info.data and v <= info.data['min_lon']:
             raise ValueError('max_lon must be greater than min_lon')
         return v
     
@@ -47,9 +50,10 @@ class CloudCoverageValidator(BaseModel):
     cloud_min: float = Field(0, ge=0, le=100, description="Minimum cloud coverage %")
     cloud_max: float = Field(30, ge=0, le=100, description="Maximum cloud coverage %")
     
-    @validator('cloud_max')
-    def validate_cloud_range(cls, v, values):
-        if 'cloud_min' in values and v < values['cloud_min']:
+    @field_validator('cloud_max')
+    @classmethod
+    def validate_cloud_range(cls, v, info: ValidationInfo):
+        if 'cloud_min' in info.data and v < info.data['cloud_min']:
             raise ValueError('cloud_max must be >= cloud_min')
         return v
 
@@ -73,12 +77,13 @@ class SatelliteSearchRequest(BaseModel):
     cloud_max: float = Field(30, ge=0, le=100, description="Max cloud coverage %")
     platform: str = Field("Sentinel-2", description="Satellite platform")
     
-    @validator('date_to')
-    def validate_date_range(cls, v, values):
-        if 'date_from' in values and v < values['date_from']:
+    @field_validator('date_to')
+    @classmethod
+    def validate_date_range(cls, v, info: ValidationInfo):
+        if 'date_from' in info.data and v < info.data['date_from']:
             raise ValueError('date_to must be after date_from')
         # Limit to 1 year for MVP
-        if 'date_from' in values and (v - values['date_from']).days > 365:
+        if 'date_from' in info.data and (v - info.data['date_from']).days > 365:
             raise ValueError('Date range cannot exceed 365 days')
         return v
 
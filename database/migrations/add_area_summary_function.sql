@@ -0,0 +1,38 @@
+-- ============================================
+-- Migration: Add area_summary RPC
+-- ============================================
+
+-- Aggregate satellite image metadata for an area in a single query,
+-- so the API receives one row instead of every matching image.
+
+CREATE OR REPLACE FUNCTION area_summary(
+    min_lat DOUBLE PRECISION,
+    max_lat DOUBLE PRECISION,
+    min_lon DOUBLE PRECISION,
+    max_lon DOUBLE PRECISION,
+    date_from DATE DEFAULT NULL,
+    date_to DATE DEFAULT NULL
+)
+RETURNS json AS $$
+    SELECT json_build_object(
+        'total_images', COUNT(*),
+        'average_cloud_coverage', COALESCE(AVG(cloud_coverage), 0),
+        'date_start', MIN(acquisition_date),
+        'date_end', MAX(acquisition_date)
+    )
+    FROM satellite_images
+    -- Split instead of COALESCE(bounds, center_point) so each branch can use
+    -- its GiST index (idx_satellite_images_bounds / _center_point)
+    WHERE (
+            ST_Intersects(bounds, ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)::geography)
+         OR (bounds IS NULL
+             AND ST_Intersects(center_point, ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)::geography))
+      )
+      AND (date_from IS NULL OR acquisition_date >= date_from)
+      AND (date_to IS NULL OR acquisition_date <= date_to);
+$$ LANGUAGE sql STABLE;
+
+-- Grant execute permission
+GRANT EXECUTE ON FUNCTION area_summary(DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, DATE, DATE) TO anon, authenticated, service_role;
+
+COMMENT ON FUNCTION area_summary(DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, DATE, DATE) IS 'Count, average cloud coverage and date range of images intersecting a bbox';
@@ -0,0 +1,18 @@
+-- ============================================
+-- Migration: Add image_has_indices RPC
+-- ============================================
+
+-- Presence of NDVI / NDWI rows for an image in one round-trip.
+-- Each EXISTS stops at the first match on the image_id index.
+
+CREATE OR REPLACE FUNCTION image_has_indices(iid UUID)
+RETURNS TABLE (has_ndvi BOOLEAN, has_ndwi BOOLEAN) AS $$
+    SELECT
+        EXISTS (SELECT 1 FROM ndvi_data WHERE image_id = iid),
+        EXISTS (SELECT 1 FROM ndwi_data WHERE image_id = iid);
+$$ LANGUAGE sql STABLE;
+
+-- Grant execute permission
+GRANT EXECUTE ON FUNCTION image_has_indices(UUID) TO anon, authenticated, service_role;
+
+COMMENT ON FUNCTION image_has_indices(UUID) IS 'Whether NDVI and NDWI data exist for a satellite image';
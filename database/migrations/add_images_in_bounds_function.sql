@@ -0,0 +1,41 @@
+-- ============================================
+-- Migration: Add images_in_bounds RPC
+-- ============================================
+
+-- Spatial lookup of satellite images overlapping a bbox.
+-- Uses the bounding-box operator && so each branch is answered straight
+-- from its GiST index without an exact geometry recheck. Footprints whose
+-- box overlaps but whose shape does not may be returned, which is fine
+-- for map browsing.
+
+CREATE INDEX IF NOT EXISTS idx_satellite_images_bounds ON satellite_images USING GIST(bounds);
+CREATE INDEX IF NOT EXISTS idx_satellite_images_center_point ON satellite_images USING GIST(center_point);
+
+CREATE OR REPLACE FUNCTION images_in_bounds(
+    min_lat DOUBLE PRECISION,
+    max_lat DOUBLE PRECISION,
+    min_lon DOUBLE PRECISION,
+    max_lon DOUBLE PRECISION,
+    cloud_max DOUBLE PRECISION DEFAULT 30,
+    lim INTEGER DEFAULT 100,
+    date_from DATE DEFAULT NULL,
+    date_to DATE DEFAULT NULL
+)
+RETURNS SETOF satellite_images AS $$
+    SELECT *
+    FROM satellite_images
+    WHERE cloud_coverage <= cloud_max
+      AND (
+            bounds && ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)::geography
+         OR center_point && ST_MakeEnvelope(min_lon, min_lat, max_lon, max_lat, 4326)::geography
+      )
+      AND (date_from IS NULL OR acquisition_date >= date_from)
+      AND (date_to IS NULL OR acquisition_date <= date_to)
+    ORDER BY acquisition_date DESC
+    LIMIT lim;
+$$ LANGUAGE sql STABLE;
+
+-- Grant execute permission
+GRANT EXECUTE ON FUNCTION images_in_bounds(DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, INTEGER, DATE, DATE) TO anon, authenticated, service_role;
+
+COMMENT ON FUNCTION images_in_bounds(DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, DOUBLE PRECISION, INTEGER, DATE, DATE) IS 'Satellite images whose footprint box overlaps a bbox (index-only, may include false positives), newest first';
@@ -0,0 +1,17 @@
+-- ============================================
+-- Migration: Add latest_acquisition_date RPC
+-- ============================================
+
+-- Most recent acquisition date as a single scalar. MAX() over the
+-- idx_satellite_images_acquisition_date btree is answered from the end
+-- of the index without reading table rows.
+
+CREATE OR REPLACE FUNCTION latest_acquisition_date()
+RETURNS TIMESTAMP AS $$
+    SELECT MAX(acquisition_date) FROM satellite_images;
+$$ LANGUAGE sql STABLE;
+
+-- Grant execute permission
+GRANT EXECUTE ON FUNCTION latest_acquisition_date() TO anon, authenticated, service_role;
+
+COMMENT ON FUNCTION latest_acquisition_date() IS 'Acquisition date of the most recent satellite image';
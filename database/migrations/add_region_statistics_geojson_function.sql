@@ -0,0 +1,46 @@
+-- ============================================
+-- Migration: Add region_statistics_geojson RPC
+-- ============================================
+
+-- Region statistics rows with their bbox already converted to GeoJSON,
+-- so the API builds a FeatureCollection from one round-trip instead of
+-- calling st_asgeojson once per row.
+
+CREATE OR REPLACE FUNCTION region_statistics_geojson(
+    target_date DATE,
+    target_index_type TEXT,
+    target_region TEXT DEFAULT NULL
+)
+RETURNS TABLE (
+    id UUID,
+    region_name TEXT,
+    date DATE,
+    index_type TEXT,
+    mean DOUBLE PRECISION,
+    min DOUBLE PRECISION,
+    max DOUBLE PRECISION,
+    std DOUBLE PRECISION,
+    sample_count INTEGER,
+    geometry json
+) AS $$
+    SELECT
+        rs.id,
+        rs.region_name,
+        rs.date,
+        rs.index_type,
+        rs.mean::double precision,
+        rs.min::double precision,
+        rs.max::double precision,
+        rs.std::double precision,
+        rs.sample_count,
+        ST_AsGeoJSON(rs.bbox::geometry)::json
+    FROM region_statistics rs
+    WHERE rs.date = target_date
+      AND rs.index_type = target_index_type
+      AND (target_region IS NULL OR rs.region_name = target_region);
+$$ LANGUAGE sql STABLE;
+
+-- Grant execute permission
+GRANT EXECUTE ON FUNCTION region_statistics_geojson(DATE, TEXT, TEXT) TO anon, authenticated, service_role;
+
+COMMENT ON FUNCTION region_statistics_geojson(DATE, TEXT, TEXT) IS 'Region statistics for a date/index with bbox as GeoJSON geometry';
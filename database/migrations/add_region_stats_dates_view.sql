@@ -0,0 +1,38 @@
+-- ============================================
+-- Migration: Add region_stats_dates materialized view
+-- ============================================
+
+-- Distinct (date, index_type, region_name) combinations from
+-- region_statistics, so available-date lookups read unique dates from an
+-- index instead of downloading every statistics row.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS region_stats_dates AS
+SELECT DISTINCT date, index_type, region_name
+FROM region_statistics;
+
+-- Unique index is required for REFRESH ... CONCURRENTLY and serves
+-- filtered, date-ordered lookups as an index-only scan
+CREATE UNIQUE INDEX IF NOT EXISTS idx_region_stats_dates
+    ON region_stats_dates (index_type, region_name, date);
+
+-- Refreshed explicitly after bulk writes (scheduler, historical import)
+-- rather than from a trigger, so each INSERT/UPDATE/DELETE doesn't pay for
+-- a full rebuild and concurrent writers don't queue on the refresh lock
+DROP TRIGGER IF EXISTS trg_refresh_region_stats_dates ON region_statistics;
+DROP FUNCTION IF EXISTS refresh_region_stats_dates();
+
+CREATE FUNCTION refresh_region_stats_dates()
+RETURNS void AS $$
+BEGIN
+    REFRESH MATERIALIZED VIEW CONCURRENTLY region_stats_dates;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Writers only; readers never need to trigger a rebuild
+REVOKE EXECUTE ON FUNCTION refresh_region_stats_dates() FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION refresh_region_stats_dates() TO service_role;
+
+-- Grant read access
+GRANT SELECT ON region_stats_dates TO anon, authenticated, service_role;
+
+COMMENT ON MATERIALIZED VIEW region_stats_dates IS 'Distinct dates per index type and region in region_statistics';